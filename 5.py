@@ -1,74 +1,99 @@
 import streamlit as st
 from youtube_transcript_api import YouTubeTranscriptApi
-from pytube import YouTube
 from youtube_transcript_api.formatters import TextFormatter
 import re
 import google.generativeai as genai
 import os
 from dotenv import load_dotenv
-from fuzzywuzzy import process
-from fuzzywuzzy import fuzz
+from rapidfuzz import process
+from rapidfuzz import fuzz
+from rapidfuzz import utils
 import requests
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime
-import json
+from collections import defaultdict, Counter
+import orjson
 import time
+import asyncio
+import hashlib
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+# --- Shared HTTP Session ---
+NBA_STATS_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Origin': 'https://www.nba.com',
+    'Referer': 'https://www.nba.com/',
+    'x-nba-stats-origin': 'stats',
+    'x-nba-stats-token': 'true'
+}
+
+def _create_session_with_retry(retries=5, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504)):
+    """Creates a requests session with retry logic and a small connection pool."""
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        read=retries,
+        connect=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=status_forcelist,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=4)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+@st.cache_resource
+def get_http_session():
+    """Session shared across Streamlit reruns so pooled connections stay warm."""
+    return _create_session_with_retry()
+
 # --- NBA Players Fetcher Class ---
 class NBAPlayersFetcher:
     def __init__(self):
         self.base_url = "https://stats.nba.com/stats/commonallplayers"
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Origin': 'https://www.nba.com',
-            'Referer': 'https://www.nba.com/',
-            'x-nba-stats-origin': 'stats',
-            'x-nba-stats-token': 'true'
-        }
-        self.cache_file = 'nba_players_cache.json'
+        self.headers = NBA_STATS_HEADERS
+        self.cache_file = 'nba_players_cache.parquet'
         self.cache_duration = 24 * 60 * 60  # 24 hours in seconds
-        self.session = self._create_session_with_retry()
-
-    def _create_session_with_retry(self, retries=5, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504)):
-        """Creates a requests session with retry logic."""
-        session = requests.Session()
-        retry = Retry(
-            total=retries,
-            read=retries,
-            connect=retries,
-            backoff_factor=backoff_factor,
-            status_forcelist=status_forcelist,
-        )
-        adapter = HTTPAdapter(max_retries=retry)
-        session.mount('http://', adapter)
-        session.mount('https://', adapter)
-        return session
+        self.session = get_http_session()
 
     def _load_cache(self):
-        """Load cached data if it exists and is not expired."""
+        """Load cached players if the cache file exists and is not expired."""
         try:
             if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r') as f:
-                    cache = json.load(f)
-                    if time.time() - cache['timestamp'] < self.cache_duration:
-                        print("Loaded from cache.")
-                        return cache['data']
-        except json.JSONDecodeError:
-            print("Error decoding JSON from cache. Fetching from API...")
+                if time.time() - os.path.getmtime(self.cache_file) < self.cache_duration:
+                    df = pd.read_parquet(self.cache_file)
+                    print("Loaded from cache.")
+                    return df
+        except (OSError, ValueError):
+            print("Error reading Parquet cache. Fetching from API...")
         return None
 
-    def _save_cache(self, data):
-        """Save data to cache with timestamp."""
-        cache = {
-            'timestamp': time.time(),
-            'data': data
-        }
-        with open(self.cache_file, 'w') as f:
-            json.dump(cache, f)
+    def _load_validators(self):
+        """Load the ETag / Last-Modified values stored alongside the cache, if any."""
+        try:
+            if os.path.exists(self.cache_file):
+                metadata = pq.read_schema(self.cache_file).metadata or {}
+                return {key: metadata[key.encode()].decode() for key in ('etag', 'last_modified')
+                        if key.encode() in metadata}
+        except (OSError, ValueError):
+            print("Error reading Parquet cache metadata.")
+        return {}
+
+    def _save_cache(self, df, etag=None, last_modified=None):
+        """Save players DataFrame to cache; the file mtime serves as the timestamp."""
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        if etag:
+            metadata[b'etag'] = etag.encode()
+        if last_modified:
+            metadata[b'last_modified'] = last_modified.encode()
+        pq.write_table(table.replace_schema_metadata(metadata), self.cache_file)
 
     def fetch_players(self, use_cache=True, invalidate_cache=False):
         """
@@ -82,9 +107,9 @@ class NBAPlayersFetcher:
             pandas.DataFrame: DataFrame containing players' information.
         """
         if use_cache and not invalidate_cache:
-            cached_data = self._load_cache()
-            if cached_data:
-                return pd.DataFrame(cached_data)
+            cached_df = self._load_cache()
+            if cached_df is not None and not cached_df.empty:
+                return cached_df
 
         try:
             params = {
@@ -92,33 +117,41 @@ class NBAPlayersFetcher:
                 'Season': self._get_current_season(),
                 'IsOnlyCurrentSeason': '1'
             }
-            response = self.session.get(self.base_url, params=params, headers=self.headers, timeout=15)
+            # Ask for the body only if the roster changed since the cached copy
+            request_headers = dict(self.headers)
+            validators = self._load_validators() if use_cache else {}
+            if 'etag' in validators:
+                request_headers['If-None-Match'] = validators['etag']
+            if 'last_modified' in validators:
+                request_headers['If-Modified-Since'] = validators['last_modified']
+
+            response = self.session.get(self.base_url, params=params, headers=request_headers, timeout=15)
+            if response.status_code == 304:
+                print("Player list unchanged. Refreshing cache timestamp.")
+                os.utime(self.cache_file)
+                return pd.read_parquet(self.cache_file)
             response.raise_for_status()
 
-            data = response.json()
+            data = orjson.loads(response.content)
 
             headers = data['resultSets'][0]['headers']
             players_data = data['resultSets'][0]['rowSet']
 
-            players = []
-            for player in players_data:
-                player_dict = dict(zip(headers, player))
-                if player_dict['TO_YEAR'] == self._get_current_season()[:4]:
-                    players.append({
-                        'player_id': player_dict['PERSON_ID'],
-                        'full_name': player_dict['DISPLAY_FIRST_LAST'],
-                        'team_id': player_dict['TEAM_ID'],
-                        'team': player_dict['TEAM_NAME'] if player_dict['TEAM_ID']!=0 else "Free Agent",
-                        'is_active': True
-                    })
-
-            df = pd.DataFrame(players)
-            self._save_cache(df.to_dict('records'))  # Save DataFrame as list of dicts
+            players = pd.DataFrame(players_data, columns=headers)
+            players = players[players['TO_YEAR'] == self._get_current_season()[:4]]
+            df = pd.DataFrame({
+                'player_id': players['PERSON_ID'].to_numpy(),
+                'full_name': players['DISPLAY_FIRST_LAST'].to_numpy(),
+                'team_id': players['TEAM_ID'].to_numpy(),
+                'team': players['TEAM_NAME'].where(players['TEAM_ID'] != 0, "Free Agent").to_numpy(),
+                'is_active': True
+            })
+            self._save_cache(df, response.headers.get('ETag'), response.headers.get('Last-Modified'))
             return df
 
         except requests.exceptions.RequestException as e:
             print(f"Request error: {e}")
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"JSON decoding error: {e}")
         except KeyError as e:
             print(f"API response format error (missing key): {e}")
@@ -127,9 +160,9 @@ class NBAPlayersFetcher:
 
         if use_cache:
             print("Using cached data as fallback (if available).")
-            cached_data = self._load_cache()
-            if cached_data:
-                return pd.DataFrame(cached_data)
+            cached_df = self._load_cache()
+            if cached_df is not None and not cached_df.empty:
+                return cached_df
 
         return pd.DataFrame()
 
@@ -153,9 +186,20 @@ model = genai.GenerativeModel('gemini-pro')
 # --- Instantiate NBA Players Fetcher ---
 nba_fetcher = NBAPlayersFetcher()
 
+@st.cache_data(ttl=24 * 60 * 60)
+def get_players_df(invalidate=False):
+    """Players DataFrame, kept in Streamlit's in-memory cache across reruns."""
+    df = nba_fetcher.fetch_players(invalidate_cache=invalidate)
+    if df.empty:
+        # Raising keeps the failed fetch out of st.cache_data so the next rerun retries
+        raise RuntimeError("No players returned from the NBA stats API or cache.")
+    return df
+
 # --- Initialize variables in session_state ---
 if 'chat' not in st.session_state:
     st.session_state.chat = None
+if 'chat_hash' not in st.session_state:
+    st.session_state.chat_hash = None
 if 'transcript' not in st.session_state:
     st.session_state.transcript = None
 if 'youtube_url' not in st.session_state:
@@ -168,27 +212,135 @@ if 'corrected_transcript' not in st.session_state:
     st.session_state.corrected_transcript = None
 if 'player_master_list' not in st.session_state:
     st.session_state.player_master_list = []
+if 'player_master_processed' not in st.session_state:
+    st.session_state.player_master_processed = []
+if 'player_bigram_index' not in st.session_state:
+    st.session_state.player_bigram_index = {}
+if 'player_master_set' not in st.session_state:
+    st.session_state.player_master_set = frozenset()
+if 'player_last_names' not in st.session_state:
+    st.session_state.player_last_names = frozenset()
+if 'player_first_names' not in st.session_state:
+    st.session_state.player_first_names = frozenset()
+if 'player_name_tokens' not in st.session_state:
+    st.session_state.player_name_tokens = frozenset()
+
+# --- Player List Helpers ---
+def update_player_master_list(df):
+    """Store the sorted player names along with their preprocessed forms for fuzzy matching."""
+    st.session_state.player_master_list = np.sort(df['full_name'].to_numpy())
+    st.session_state.player_master_processed = [utils.default_process(name) for name in st.session_state.player_master_list]
+    st.session_state.player_bigram_index = build_bigram_index(st.session_state.player_master_processed)
+    st.session_state.player_master_set = frozenset(st.session_state.player_master_list)
+    st.session_state.player_last_names = frozenset(_last_name(name) for name in st.session_state.player_master_list)
+    st.session_state.player_first_names = frozenset(name.split()[0] for name in st.session_state.player_master_list)
+    st.session_state.player_name_tokens = frozenset(token for name in st.session_state.player_master_processed for token in name.split())
+
+NAME_SUFFIXES = frozenset({"Jr.", "Jr", "Sr.", "Sr", "II", "III", "IV"})
+
+def _last_name(name):
+    """Last token of a player's name, ignoring generational suffixes like "Jr." or "III"."""
+    tokens = name.split()
+    while len(tokens) > 1 and tokens[-1] in NAME_SUFFIXES:
+        tokens.pop()
+    return tokens[-1]
+
+def _bigrams(text):
+    """Character bigrams of each word in an already-processed name."""
+    return {word[i:i + 2] for word in text.split() for i in range(len(word) - 1)}
+
+def build_bigram_index(player_master_processed):
+    """Map each character bigram to the indices of the players whose names contain it."""
+    index = defaultdict(list)
+    for player_index, name in enumerate(player_master_processed):
+        for bigram in _bigrams(name):
+            index[bigram].append(player_index)
+    return dict(index)
+
+def find_player_shortlist(processed_name, bigram_index, min_shared=2):
+    """Indices of players sharing at least `min_shared` bigrams with the name."""
+    bigrams = _bigrams(processed_name)
+    shared = Counter()
+    for bigram in bigrams:
+        shared.update(bigram_index.get(bigram, ()))
+    threshold = min(min_shared, len(bigrams))
+    return sorted(player_index for player_index, count in shared.items() if count >= threshold)
 
 # --- Fetch and update player_master_list (on app start) ---
-if not st.session_state.player_master_list:
+if not len(st.session_state.player_master_list):
     with st.spinner("Updating player list..."):
         try:
-            df = nba_fetcher.fetch_players()
-            st.session_state.player_master_list = df['full_name'].tolist()
-            st.session_state.player_master_list.sort()
+            df = get_players_df()
+            update_player_master_list(df)
             st.success("Player list updated!")
         except Exception as e:
             st.error(f"Failed to update player list: {e}")
 
 # --- Fuzzy Matching Function ---
-def find_closest_player_name(transcript_name, player_master_list):
-    best_match, score = process.extractOne(transcript_name, player_master_list, scorer=fuzz.token_set_ratio)
-    if score >= 80:
-        return best_match
-    else:
+# Title-cased words that are never player names and are not worth fuzzy matching
+STOPWORDS = frozenset({
+    "The", "A", "An", "And", "But", "Or", "So", "If", "He", "She", "It", "We", "They", "I", "You",
+    "Is", "In", "On", "At", "To", "Of", "For", "With", "This", "That", "These", "Those", "There",
+    "Then", "What", "When", "Where", "Which", "Who", "Why", "How", "Just", "Also", "Yeah", "Okay",
+    "Well", "Now", "Here", "Some", "Like", "Because", "Right", "Good", "Great", "Really", "Maybe",
+    "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday",
+})
+
+def find_closest_player_name(transcript_name, player_master_list, player_master_processed=None, bigram_index=None):
+    if player_master_processed is None:
+        player_master_processed = [utils.default_process(name) for name in player_master_list]
+    if bigram_index is None:
+        bigram_index = build_bigram_index(player_master_processed)
+
+    # Only score against players that share enough bigrams with the name
+    processed_name = utils.default_process(transcript_name)
+    shortlist = find_player_shortlist(processed_name, bigram_index)
+    if not shortlist:
         return None
+    # WRatio's partial scoring would let a single word match a substring of a name,
+    # so single words are scored on whole tokens with token_set_ratio instead
+    if len(processed_name.split()) > 1:
+        scorer, score_cutoff = fuzz.WRatio, 88
+    else:
+        scorer, score_cutoff = fuzz.token_set_ratio, 80
+    match = process.extractOne(processed_name, [player_master_processed[i] for i in shortlist],
+                                scorer=scorer, processor=None, score_cutoff=score_cutoff)
+    if match:
+        return player_master_list[shortlist[match[2]]]
+    return None
+
+_TRAILING_PUNCTUATION = '.,!?;:"\')'
+
+def _split_trailing_punctuation(word):
+    """Split a word into its body and trailing punctuation or possessive, e.g. "Curry," -> ("Curry", ",")."""
+    body = word.rstrip(_TRAILING_PUNCTUATION)
+    if len(body) > 2 and body.endswith("'s"):
+        body = body[:-2]
+    return body, word[len(body):]
+
+def _attach_suffix(name, suffix):
+    """Put a word's trailing punctuation back after a name, without doubling a period the name already ends with."""
+    name_suffix = _split_trailing_punctuation(name)[1]
+    if name_suffix and suffix.startswith(name_suffix):
+        suffix = suffix[len(name_suffix):]
+    return name + suffix
+
+def _is_name_window(window, player_name_tokens=frozenset()):
+    """Whether a run of transcript words is worth fuzzy matching against player names."""
+    first = _split_trailing_punctuation(window[0])[0]
+    if not first.istitle() or not first.isalpha() or first in STOPWORDS:
+        return False
+    if len(window) == 1:
+        return len(first) >= 4
+    # Later words may be lowercase in auto-generated captions, so also accept any word
+    # whose processed form appears in a player name
+    return all(word.istitle() or set(utils.default_process(word).split()) <= player_name_tokens
+               for word in window[1:])
 
 # --- Transcript Handling Functions ---
+_WHITESPACE_RE = re.compile(r'\s+')
+_VIDEO_ID_RE = re.compile(r'(?:v=|youtu\.be/|/shorts/|/embed/|/live/|/v/)([A-Za-z0-9_-]{11})')
+
 def get_transcript(youtube_url):
     try:
         video_id = extract_video_id(youtube_url)
@@ -196,7 +348,13 @@ def get_transcript(youtube_url):
         formatter = TextFormatter()
         formatted_transcript = formatter.format_transcript(transcript)
         cleaned_transcript = clean_transcript(formatted_transcript)
-        st.session_state.corrected_transcript = correct_player_names(cleaned_transcript, st.session_state.player_master_list)
+        st.session_state.corrected_transcript = correct_player_names(cleaned_transcript, st.session_state.player_master_list,
+                                                                       st.session_state.player_master_processed,
+                                                                       st.session_state.player_bigram_index,
+                                                                       st.session_state.player_master_set,
+                                                                       st.session_state.player_last_names,
+                                                                       st.session_state.player_first_names,
+                                                                       st.session_state.player_name_tokens)
         return st.session_state.corrected_transcript
     except YouTubeTranscriptApi.NoTranscriptFound:
         return "No transcript found for this video."
@@ -204,39 +362,140 @@ def get_transcript(youtube_url):
         return f"An error occurred: {e}"
 
 def extract_video_id(youtube_url):
-    try:
-        yt = YouTube(youtube_url)
-        return yt.video_id
-    except Exception as e:
-        st.error(f"Error extracting video ID: {e}")
-        return None
+    match = _VIDEO_ID_RE.search(youtube_url)
+    if match:
+        return match.group(1)
+    st.error(f"Error extracting video ID: unrecognized YouTube URL {youtube_url!r}")
+    return None
 
 def clean_transcript(text):
-    text = text.strip()
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'[^\x00-\x7F]+', '', text)
+    text = _WHITESPACE_RE.sub(' ', text.strip())
+    text = text.encode('ascii', 'ignore').decode('ascii')  # Drop non-ASCII characters
     return text
 
-def correct_player_names(transcript, player_master_list):
+def correct_player_names(transcript, player_master_list, player_master_processed=None, bigram_index=None,
+                         player_master_set=None, player_last_names=None, player_first_names=None,
+                         player_name_tokens=None):
     words = transcript.split()
-    corrected_words = []
-    for word in words:
-        if word.istitle():
-            possible_player_name = find_closest_player_name(word, player_master_list)
-            if possible_player_name:
-                corrected_words.append(possible_player_name)
+    if not len(player_master_list):
+        return " ".join(words)
+
+    if player_master_processed is None:
+        player_master_processed = [utils.default_process(name) for name in player_master_list]
+    if bigram_index is None:
+        bigram_index = build_bigram_index(player_master_processed)
+    if player_master_set is None:
+        player_master_set = frozenset(player_master_list)
+    if player_last_names is None:
+        player_last_names = frozenset(_last_name(name) for name in player_master_list)
+    if player_first_names is None:
+        player_first_names = frozenset(name.split()[0] for name in player_master_list)
+    if player_name_tokens is None:
+        player_name_tokens = frozenset(token for name in player_master_processed for token in name.split())
+
+    # Slide a 1-3 word window so multi-word names are matched as a whole,
+    # recording which windows should be rewritten to which player name
+    replacements = {}
+    matches = {}
+    i = 0
+    while i < len(words):
+        word = words[i]
+        if word[-1] in _TRAILING_PUNCTUATION or word.endswith("'s"):
+            word = _split_trailing_punctuation(word)[0]
+        # A word that is not title-cased and starts no name exactly cannot begin a match
+        if not word.istitle() and word not in player_first_names and word not in player_last_names:
+            i += 1
+            continue
+        for n in (3, 2, 1):
+            window = words[i:i + n]
+            if len(window) < n:
+                continue
+            candidate = " ".join(window)
+            # Match on the window without the last word's punctuation, which is put back afterwards
+            body, suffix = _split_trailing_punctuation(window[-1])
+            name_window = window[:-1] + [body]
+            name_candidate = " ".join(name_window)
+            if candidate in player_master_set:
+                match, suffix = candidate, ""
+            elif not body or any(_split_trailing_punctuation(w)[1] for w in window[:-1]):
+                # Punctuation inside the window means it spans more than one name
+                match = None
+            elif name_candidate in player_master_set or (n == 1 and name_candidate in player_last_names):
+                match = name_candidate
+            elif _is_name_window(name_window, player_name_tokens):
+                if name_candidate not in matches:
+                    matches[name_candidate] = find_closest_player_name(name_candidate, player_master_list, player_master_processed, bigram_index)
+                match = matches[name_candidate]
+                # A window must not swallow more words than the name it matched
+                if match and len(match.split()) < n:
+                    match = None
             else:
-                corrected_words.append(word)
+                match = None
+            if match:
+                # A window that matched only the start of a longer name also takes the following
+                # words that spell out the rest of it, so "Nikola jokic" is not left as "Nikola Jokic jokic"
+                consumed = n
+                name_tokens = match.split()
+                while not suffix and consumed < len(name_tokens) and i + consumed < len(words):
+                    next_body, next_suffix = _split_trailing_punctuation(words[i + consumed])
+                    if not next_body or fuzz.ratio(next_body, name_tokens[consumed], processor=utils.default_process) < 80:
+                        break
+                    consumed += 1
+                    suffix = next_suffix
+                replacements[" ".join(words[i:i + consumed])] = _attach_suffix(match, suffix)
+                i += consumed
+                break
         else:
-            corrected_words.append(word)
-    return " ".join(corrected_words)
+            i += 1
+
+    text = " ".join(words)
+    if all(candidate == match for candidate, match in replacements.items()):
+        return text
+    # Apply every rewrite in one pass; longer windows come first so they win over their prefixes,
+    # and unchanged names stay in the pattern so a shorter key cannot match inside them
+    pattern = re.compile(r'(?<!\S)(' + '|'.join(map(re.escape, sorted(replacements, key=len, reverse=True))) + r')(?!\S)')
+    return pattern.sub(lambda m: replacements[m.group(1)], text)
 
 # --- Gemini Chat Initialization ---
+TRANSCRIPT_CHUNK_SIZE = 8000  # characters per summarized chunk
+LONG_TRANSCRIPT_SIZE = 32000  # transcripts longer than this are summarized before chatting
+MAX_CONCURRENT_SUMMARIES = 4  # keeps long transcripts under Gemini's per-minute rate limits
+
+def chunk_text(text, size=TRANSCRIPT_CHUNK_SIZE):
+    for i in range(0, len(text), size):
+        yield text[i:i + size]
+
+async def _summarize_chunks(chunks):
+    """Summarize chunks concurrently, at most MAX_CONCURRENT_SUMMARIES requests at a time."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_SUMMARIES)
+
+    async def summarize_chunk(chunk):
+        async with semaphore:
+            response = await model.generate_content_async(
+                "Summarize this chunk of a YouTube video transcript. Keep every player name, "
+                f"injury update, statistic and fantasy basketball recommendation:\n\n{chunk}"
+            )
+            return response.text
+
+    return await asyncio.gather(*[summarize_chunk(chunk) for chunk in chunks])
+
+def summarize_transcript(transcript):
+    """Summarize a long transcript chunk by chunk, keeping player names and fantasy-relevant details."""
+    summaries = asyncio.run(_summarize_chunks(list(chunk_text(transcript))))
+    return "\n\n".join(summaries)
+
 def initialize_gemini_chat(transcript):
+    context = f"This is the transcript of a YouTube video:\n\n{transcript}"
+    if len(transcript) > LONG_TRANSCRIPT_SIZE:
+        try:
+            context = f"This is a section-by-section summary of the transcript of a YouTube video:\n\n{summarize_transcript(transcript)}"
+        except Exception as e:
+            # A failed or safety-blocked chunk should not stop the chat from loading
+            st.warning(f"Could not summarize the transcript ({e}). Loading the full transcript instead.")
     chat = model.start_chat(history=[
         {
             "role": "user",
-            "parts": [f"This is the transcript of a YouTube video:\n\n{transcript}"]
+            "parts": [context]
         },
         {
             "role": "model",
@@ -266,9 +525,9 @@ st.title("YouTube Transcript Analyzer with Gemini")
 if st.button("Update Player List"):
     with st.spinner("Updating player list..."):
         try:
-            df = nba_fetcher.fetch_players(invalidate_cache=True)
-            st.session_state.player_master_list = df['full_name'].tolist()
-            st.session_state.player_master_list.sort()
+            get_players_df.clear()
+            df = get_players_df(invalidate=True)
+            update_player_master_list(df)
             st.success("Player list updated!")
         except Exception as e:
             st.error(f"Failed to update player list: {e}")
@@ -286,8 +545,15 @@ if st.button("Get Transcript"):
 
 if st.session_state.transcript:
     if st.button("Load Transcript into Gemini"):
-        with st.spinner("Loading transcript into Gemini..."):
-            st.session_state.chat = initialize_gemini_chat(st.session_state.corrected_transcript)
+        if not st.session_state.corrected_transcript:
+            st.warning("No transcript available to load. Please fetch a transcript first.")
+        else:
+            # Only re-upload when the transcript differs from the one already in the chat
+            transcript_hash = hashlib.blake2b(st.session_state.corrected_transcript.encode(), digest_size=8).hexdigest()
+            if st.session_state.chat is None or transcript_hash != st.session_state.chat_hash:
+                with st.spinner("Loading transcript into Gemini..."):
+                    st.session_state.chat = initialize_gemini_chat(st.session_state.corrected_transcript)
+                    st.session_state.chat_hash = transcript_hash
             st.success("Transcript loaded into Gemini. You can now ask questions!")
 
 if st.session_state.chat is not None:
@@ -306,8 +572,30 @@ if st.session_state.chat is not None:
             user_question = st.session_state.user_question
 
         if user_question:
-            with st.spinner("Gemini is thinking..."):
-                st.session_state.chat.send_message(user_question)
-                st.write(f"Gemini: {st.session_state.chat.last.text}")
+            placeholder = st.empty()
+            answer_parts = []
+            response = None
+            error = None
+            try:
+                with st.spinner("Gemini is thinking..."):
+                    response = st.session_state.chat.send_message(user_question, stream=True)
+                # Render the answer progressively as chunks arrive
+                for chunk in response:
+                    answer_parts.append(chunk.text)
+                    placeholder.write("Gemini: " + "".join(answer_parts))
+            except Exception as e:
+                error = e
+            finally:
+                # The chat history stays unreadable until the stream is fully consumed, including
+                # when a rerun interrupts the loop above; after a failure resolve() would only re-raise it
+                if response is not None and error is None:
+                    try:
+                        response.resolve()
+                    except Exception as e:
+                        error = e
+            if error is not None:
+                # Force the next "Load Transcript into Gemini" click to start a fresh chat
+                st.session_state.chat_hash = None
+                st.error(f"Gemini request failed: {error}. Load the transcript into Gemini again to start a fresh chat.")
         else:
             st.warning("Please enter a question or select a prompt.")
\ No newline at end of file